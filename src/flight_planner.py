@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import argparse
 import csv
-from dataclasses import dataclass
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Literal, Optional
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 import heapq
 
 # ---------------------------------------------------------------------------
@@ -12,10 +17,20 @@ import heapq
 # ---------------------------------------------------------------------------
 
 MIN_LAYOVER_MINUTES: int = 60
+INF: int = sys.maxsize
 Cabin = Literal["economy", "business", "first"]
+CABINS: Tuple[Cabin, ...] = ("economy", "business", "first")
+CABIN_IDX: Dict[str, int] = {cabin: i for i, cabin in enumerate(CABINS)}
 
 
-@dataclass(frozen=True)
+def _cabin_index(cabin: Cabin) -> int:
+    try:
+        return CABIN_IDX[cabin]
+    except KeyError:
+        raise ValueError(f"Unknown cabin: {cabin}")
+
+
+@dataclass(frozen=True, slots=True)
 class Flight:
     origin: str
     dest: str
@@ -25,19 +40,20 @@ class Flight:
     economy: int
     business: int
     first: int
+    # (economy, business, first), indexed by CABIN_IDX; derived from the fields above.
+    prices: Tuple[int, int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "prices", (self.economy, self.business, self.first))
 
     def price_for(self, cabin: Cabin) -> int:
-        if cabin == "economy":
-            return self.economy
-        elif cabin == "business":
-            return self.business
-        elif cabin == "first":
-            return self.first
-        else:
+        # Cabin names double as field names; the check keeps other fields unreachable.
+        if cabin not in CABIN_IDX:
             raise ValueError(f"Unknown cabin: {cabin}")
+        return getattr(self, cabin)
 
 
-@dataclass
+@dataclass(slots=True)
 class Itinerary:
     flights: List[Flight]
 
@@ -61,20 +77,43 @@ class Itinerary:
         return self.flights[-1].arrive if self.flights else None
 
     def total_price(self, cabin: Cabin) -> int:
-        return sum(f.price_for(cabin) for f in self.flights)
+        ci = _cabin_index(cabin)
+        return sum(f.prices[ci] for f in self.flights)
 
     def num_stops(self) -> int:
         return max(0, len(self.flights) - 1)
 
 
-Graph = Dict[str, List[Flight]]
+Graph = Dict[str, List[Flight]]  # each list sorted by depart (see build_graph)
+_depart_key = attrgetter("depart")
 
 
 # ---------------------------------------------------------------------------
 # Time helpers
 # ---------------------------------------------------------------------------
 
+def _fast_parse_time(hhmm: str) -> Optional[int]:
+    """Parse a well-formed "HH:MM" with character arithmetic; None means use the slow path."""
+    if len(hhmm) != 5 or hhmm[2] != ":":
+        return None
+    h1 = ord(hhmm[0]) - 48
+    h0 = ord(hhmm[1]) - 48
+    m1 = ord(hhmm[3]) - 48
+    m0 = ord(hhmm[4]) - 48
+    if not (0 <= h1 <= 2 and 0 <= h0 <= 9 and 0 <= m1 <= 5 and 0 <= m0 <= 9):
+        return None
+    hour = h1 * 10 + h0
+    if hour >= 24:
+        return None
+    return hour * 60 + m1 * 10 + m0
+
+
+@lru_cache(maxsize=4096)  # schedules reuse the same HH:MM strings heavily
 def parse_time(hhmm: str) -> int:
+    minutes = _fast_parse_time(hhmm)
+    if minutes is not None:
+        return minutes
+    # Slow path: tolerant of whitespace/single digits, and produces the error messages.
     parts = hhmm.strip().split(":")
     if len(parts) != 2:
         raise ValueError(f"Invalid time format: {hhmm}")
@@ -89,7 +128,13 @@ def parse_time(hhmm: str) -> int:
     return hour * 60 + minute
 
 
+MINUTES_PER_DAY = 24 * 60
+_TIME_STR: List[str] = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+
+
 def format_time(minutes: int) -> str:
+    if 0 <= minutes < MINUTES_PER_DAY:
+        return _TIME_STR[minutes]
     hour = minutes // 60
     minute = minutes % 60
     return f"{hour:02d}:{minute:02d}"
@@ -112,8 +157,8 @@ def parse_flight_line_txt(line: str) -> Optional[Flight]:
     if arrive_min <= depart_min:
         raise ValueError(f"Arrival must be after departure: {line}")
     return Flight(
-        origin=origin,
-        dest=dest,
+        origin=sys.intern(origin),
+        dest=sys.intern(dest),
         flight_number=num,
         depart=depart_min,
         arrive=arrive_min,
@@ -123,44 +168,91 @@ def parse_flight_line_txt(line: str) -> Optional[Flight]:
     )
 
 
+FIELDS_PER_FLIGHT = 8
+CSV_COLUMNS = ("origin", "dest", "flight_number", "depart", "arrive", "economy", "business", "first")
+
+
+def _flights_from_columns(columns: Sequence[Sequence[str]]) -> List[Flight]:
+    """Build flights from raw string columns given in CSV_COLUMNS order.
+
+    Airport codes are interned so every flight shares one string per airport.
+    """
+    origins, dests, numbers, departs, arrives, economy, business, first = columns
+    # Convert column by column so the per-value work runs inside map().
+    depart_min = list(map(parse_time, departs))
+    arrive_min = list(map(parse_time, arrives))
+    bad = next((i for i, (d, a) in enumerate(zip(depart_min, arrive_min)) if a <= d), None)
+    if bad is not None:
+        raise ValueError(f"Arrival must be after departure: {' '.join(col[bad] for col in columns)}")
+    return list(
+        map(
+            Flight,
+            map(sys.intern, origins),
+            map(sys.intern, dests),
+            numbers,
+            depart_min,
+            arrive_min,
+            map(int, economy),
+            map(int, business),
+            map(int, first),
+        )
+    )
+
+
+def _load_flights_txt_bulk(lines: List[str]) -> Optional[List[Flight]]:
+    """Fast path: tokenize every line up front and slice fields in 8-token strides.
+
+    Returns None when any line is malformed so the caller can re-parse line by
+    line and report the offending line number.
+    """
+    rows = [parts for parts in map(str.split, lines) if parts and not parts[0].startswith("#")]
+    if any(len(parts) != FIELDS_PER_FLIGHT for parts in rows):
+        return None
+    tokens = list(chain.from_iterable(rows))
+    try:
+        return _flights_from_columns([tokens[i::FIELDS_PER_FLIGHT] for i in range(FIELDS_PER_FLIGHT)])
+    except ValueError:
+        return None
+
+
 def load_flights_txt(path: str) -> List[Flight]:
-    flights: List[Flight] = []
     with open(path, encoding="utf-8") as f:
-        for lineno, line in enumerate(f, start=1):
-            try:
-                flight = parse_flight_line_txt(line)
-                if flight:
-                    flights.append(flight)
-            except ValueError as e:
-                raise ValueError(f"{path}:{lineno}: {e}")
+        lines = f.read().split("\n")
+    flights = _load_flights_txt_bulk(lines)
+    if flights is not None:
+        return flights
+
+    flights = []
+    for lineno, line in enumerate(lines, start=1):
+        try:
+            flight = parse_flight_line_txt(line)
+            if flight:
+                flights.append(flight)
+        except ValueError as e:
+            raise ValueError(f"{path}:{lineno}: {e}")
     return flights
 
 
 def load_flights_csv(path: str) -> List[Flight]:
-    flights: List[Flight] = []
-    with open(path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        required_cols = {"origin","dest","flight_number","depart","arrive","economy","business","first"}
-        if not required_cols.issubset(reader.fieldnames or []):
-            raise ValueError(f"Missing required CSV columns: {required_cols}")
-        for row in reader:
-            depart = parse_time(row["depart"])
-            arrive = parse_time(row["arrive"])
-            if arrive <= depart:
-                raise ValueError(f"Arrival must be after departure: {row}")
-            flights.append(
-                Flight(
-                    origin=row["origin"],
-                    dest=row["dest"],
-                    flight_number=row["flight_number"],
-                    depart=depart,
-                    arrive=arrive,
-                    economy=int(row["economy"]),
-                    business=int(row["business"]),
-                    first=int(row["first"]),
-                )
-            )
-    return flights
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if not set(CSV_COLUMNS).issubset(header):
+            raise ValueError(f"Missing required CSV columns: {set(CSV_COLUMNS)}")
+        # Pull the required columns out of every row in CSV_COLUMNS order.
+        # csv.reader yields [] for blank lines; skip them as DictReader did.
+        positions = [header.index(c) for c in CSV_COLUMNS]
+        pick = itemgetter(*positions)
+        try:
+            rows = list(map(pick, filter(None, reader)))
+        except IndexError:
+            # map() stops on the offending row, so line_num still points at it.
+            raise ValueError(
+                f"{path}:{reader.line_num}: Expected at least {max(positions) + 1} fields"
+            ) from None
+    if not rows:
+        return []
+    return _flights_from_columns(list(zip(*rows)))
 
 
 def load_flights(path: str) -> List[Flight]:
@@ -178,6 +270,9 @@ def build_graph(flights: Iterable[Flight]) -> Graph:
     g: Graph = {}
     for f in flights:
         g.setdefault(f.origin, []).append(f)
+    # Sorted by departure so searches can bisect to the first feasible flight.
+    for outgoing in g.values():
+        outgoing.sort(key=_depart_key)
     return g
 
 
@@ -185,6 +280,33 @@ def build_graph(flights: Iterable[Flight]) -> Graph:
 # Search functions
 # ---------------------------------------------------------------------------
 
+# Immutable linked path: (last flight, path before it); None is the empty path.
+# Competing heap entries share their common prefix instead of copying it.
+PathNode = Tuple[Flight, Optional["PathNode"]]
+
+
+def _build_itinerary(node: Optional[PathNode]) -> Itinerary:
+    """Walk a path node back to the start and return the itinerary."""
+    path: List[Flight] = []
+    while node is not None:
+        flight, node = node
+        path.append(flight)
+    path.reverse()
+    return Itinerary(path)
+
+
+def _itinerary_from_arrivals(arrived_by: Dict[str, Flight], dest: str) -> Itinerary:
+    """Follow each airport's arriving flight back to the start and return the itinerary."""
+    path: List[Flight] = []
+    airport = dest
+    while airport in arrived_by:
+        flight = arrived_by[airport]
+        path.append(flight)
+        airport = flight.origin
+    path.reverse()
+    return Itinerary(path)
+
+
 def find_earliest_itinerary(
     graph: Graph,
     start: str,
@@ -192,23 +314,86 @@ def find_earliest_itinerary(
     earliest_departure: int,
 ) -> Optional[Itinerary]:
 
-    heap = [(earliest_departure, start, [])]  # (current_time, airport, path)
-    visited: Dict[str, int] = {}
+    # Label-setting sweep: arrival time only grows along a path, so the open
+    # airport with the smallest arrival is final when taken. Airport counts are
+    # small, so a min() scan over the open set replaces the heap.
+    open_airports: Dict[str, int] = {start: earliest_departure}
+    visited: Dict[str, int] = {start: earliest_departure}  # best arrival seen per airport
+    arrived_by: Dict[str, Flight] = {}  # flight that achieved visited[airport]
+
+    outgoing, best = graph.get, visited.get
+
+    while open_airports:
+        airport = min(open_airports, key=open_airports.__getitem__)
+        current_time = open_airports.pop(airport)
+        if airport == dest and airport in arrived_by:
+            return _itinerary_from_arrivals(arrived_by, dest)
+        # First flight may leave at current_time; connections need a layover.
+        threshold = current_time + MIN_LAYOVER_MINUTES if airport in arrived_by else current_time
+        flights = outgoing(airport, ())
+        for f in flights[bisect_left(flights, threshold, key=_depart_key):]:
+            if f.arrive < best(f.dest, INF):
+                visited[f.dest] = open_airports[f.dest] = f.arrive
+                arrived_by[f.dest] = f
+    return None
+
+
+def _cheapest_sweep(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    ci: int,
+) -> Optional[Itinerary]:
+    """Dijkstra by total price, reading each flight's price at ``prices[ci]``."""
+    # Heap items: (total_price, current_time, counter, airport, path node).
+    counter = 0
+    heap: List[Tuple[int, int, int, str, Optional[PathNode]]] = [(0, earliest_departure, counter, start, None)]
+    # Best (total_price, arrival) pushed so far per airport; only strict improvements
+    # are pushed. Arrival breaks price ties the same way the heap order does.
+    visited: Dict[str, Tuple[int, int]] = {start: (0, earliest_departure)}
+    unseen = (INF, INF)
+
+    heappush, heappop = heapq.heappush, heapq.heappop
+    outgoing, best = graph.get, visited.get
 
     while heap:
-        current_time, airport, path = heapq.heappop(heap)
-        if airport == dest and path:
-            return Itinerary(path)
-        if airport in visited and visited[airport] <= current_time:
+        total_price, current_time, _, airport, node = heappop(heap)
+        if airport == dest and node is not None:
+            return _build_itinerary(node)
+        # heapq has no decrease-key: skip entries superseded by a better label.
+        if best(airport) != (total_price, current_time):
             continue
-        visited[airport] = current_time
-        for f in graph.get(airport, []):
-            layover_ok = f.depart >= current_time if not path else f.depart >= current_time + MIN_LAYOVER_MINUTES
-            if layover_ok:
-                heapq.heappush(heap, (f.arrive, f.dest, path + [f]))
+        threshold = current_time if node is None else current_time + MIN_LAYOVER_MINUTES
+        flights = outgoing(airport, ())
+        for f in flights[bisect_left(flights, threshold, key=_depart_key):]:
+            new_price = total_price + f.prices[ci]
+            if (new_price, f.arrive) < best(f.dest, unseen):
+                visited[f.dest] = (new_price, f.arrive)
+                counter += 1
+                heappush(heap, (new_price, f.arrive, counter, f.dest, (f, node)))
     return None
 
 
+def find_cheapest_multicabin(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabins: Sequence[Cabin] = CABINS,
+) -> Dict[Cabin, Optional[Itinerary]]:
+    """Cheapest itinerary for each requested cabin.
+
+    The cabins are searched one after another: each one settles airports in a
+    different price order, so a merged heap shares no pops and only grows.
+    """
+    price_idx = [_cabin_index(c) for c in cabins]
+    return {
+        cabin: _cheapest_sweep(graph, start, dest, earliest_departure, ci)
+        for cabin, ci in zip(cabins, price_idx)
+    }
+
+
 def find_cheapest_itinerary(
     graph: Graph,
     start: str,
@@ -216,29 +401,14 @@ def find_cheapest_itinerary(
     earliest_departure: int,
     cabin: Cabin,
 ) -> Optional[Itinerary]:
-
-    heap = [(0, earliest_departure, start, [])]  # (total_price, current_time, airport, path)
-    visited: Dict[str, int] = {}
-
-    while heap:
-        total_price, current_time, airport, path = heapq.heappop(heap)
-        if airport == dest and path:
-            return Itinerary(path)
-        if airport in visited and visited[airport] <= total_price:
-            continue
-        visited[airport] = total_price
-        for f in graph.get(airport, []):
-            layover_ok = f.depart >= current_time if not path else f.depart >= current_time + MIN_LAYOVER_MINUTES
-            if layover_ok:
-                heapq.heappush(heap, (total_price + f.price_for(cabin), f.arrive, f.dest, path + [f]))
-    return None
+    return _cheapest_sweep(graph, start, dest, earliest_departure, _cabin_index(cabin))
 
 
 # ---------------------------------------------------------------------------
 # Formatting the comparison table
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonRow:
     mode: str
     cabin: Optional[Cabin]
@@ -246,35 +416,43 @@ class ComparisonRow:
     note: str = ""
 
 
+# Column layout shared by the header and every row: Mode, Cabin, Dep, Arr,
+# Duration, Stops, Total Price, Note.
+_ROW_FMT = "{:20} {:10} {:6} {:6} {:10} {:5} {:12} {}"
+_TABLE_HEADER = _ROW_FMT.format("Mode", "Cabin", "Dep", "Arr", "Duration", "Stops", "Total Price", "Note")
+_TABLE_RULE = "-" * len(_TABLE_HEADER)
+_NA = "N/A"
+
+
 def format_comparison_table(
     origin: str,
     dest: str,
     earliest_departure: int,
     rows: List[ComparisonRow],
 ) -> str:
-    lines = []
     # Include route and earliest departure info so output is self-contained.
-    lines.append(f"Route: {origin} -> {dest}  Earliest: {format_time(earliest_departure)}")
-    lines.append("")
-    header = f"{'Mode':20} {'Cabin':10} {'Dep':6} {'Arr':6} {'Duration':10} {'Stops':5} {'Total Price':12} {'Note'}"
-    lines.append(header)
-    lines.append("-" * len(header))
+    lines = [
+        f"Route: {origin} -> {dest}  Earliest: {format_time(earliest_departure)}",
+        "",
+        _TABLE_HEADER,
+        _TABLE_RULE,
+    ]
+    row_fmt = _ROW_FMT.format
 
     for row in rows:
         itin = row.itinerary
         if itin is None:
-            dep = arr = dur = stops = price = "N/A"
+            dep = arr = dur = stops = price = _NA
         else:
             dep = format_time(itin.depart_time)
             arr = format_time(itin.arrive_time)
             duration_min = itin.arrive_time - itin.depart_time
             dur = f"{duration_min // 60}h{duration_min % 60}m"
             stops = str(itin.num_stops())
-            price = str(itin.total_price(row.cabin)) if row.cabin else "N/A"
+            price = str(itin.total_price(row.cabin)) if row.cabin else _NA
 
         cabin_str = row.cabin if row.cabin else "-"
-        line = f"{row.mode:20} {cabin_str:10} {dep:6} {arr:6} {dur:10} {stops:5} {price:12} {row.note}"
-        lines.append(line)
+        lines.append(row_fmt(row.mode, cabin_str, dep, arr, dur, stops, price, row.note))
     return "\n".join(lines)
 
 
@@ -286,17 +464,20 @@ def run_compare(args: argparse.Namespace) -> None:
     earliest_departure = parse_time(args.departure_time)
     flights = load_flights(args.flight_file)
     graph = build_graph(flights)
+    # Same interned objects as the loaded airport codes, so == is an identity check.
+    origin, dest = sys.intern(args.origin), sys.intern(args.dest)
 
     rows: List[ComparisonRow] = []
 
-    earliest_itin = find_earliest_itinerary(graph, args.origin, args.dest, earliest_departure)
+    earliest_itin = find_earliest_itinerary(graph, origin, dest, earliest_departure)
     rows.append(ComparisonRow(mode="Earliest arrival", cabin=None, itinerary=earliest_itin, note="" if earliest_itin else "(no valid itinerary)"))
 
-    for cabin in ["economy", "business", "first"]:
-        cheapest_itin = find_cheapest_itinerary(graph, args.origin, args.dest, earliest_departure, cabin)
+    cheapest = find_cheapest_multicabin(graph, origin, dest, earliest_departure, CABINS)
+    for cabin in CABINS:
+        cheapest_itin = cheapest[cabin]
         rows.append(ComparisonRow(mode=f"Cheapest ({cabin.capitalize()})", cabin=cabin, itinerary=cheapest_itin, note="" if cheapest_itin else "(no valid itinerary)"))
 
-    table = format_comparison_table(args.origin, args.dest, earliest_departure, rows)
+    table = format_comparison_table(origin, dest, earliest_departure, rows)
     print(table)
 
 
@@ -10,6 +10,7 @@ from flight_planner import (
     build_graph,
     find_earliest_itinerary,
     find_cheapest_itinerary,
+    find_cheapest_multicabin,
     MIN_LAYOVER_MINUTES,
     parse_time,
 )
@@ -65,6 +66,17 @@ def test_build_graph_basic():
     assert {fl.dest for fl in graph["B"]} == {"C"}
 
 
+def test_build_graph_sorts_outgoing_by_departure():
+    flights = [
+        f("A", "B", "F1", "12:00", "13:00", 100, 200, 300),
+        f("A", "C", "F2", "08:00", "09:00", 100, 200, 300),
+        f("A", "B", "F3", "10:00", "11:00", 100, 200, 300),
+    ]
+    graph = build_graph(flights)
+
+    assert [fl.flight_number for fl in graph["A"]] == ["F2", "F3", "F1"]
+
+
 def test_earliest_itinerary_direct_vs_connecting():
     # Direct is earlier arrival than connect.
     flights = [
@@ -222,6 +234,78 @@ def test_cheapest_itinerary_can_differ_by_cabin():
     assert biz_itin.flights[0].flight_number == "Fdirect"
 
 
+def test_cheapest_itinerary_keeps_earlier_arrival_on_price_tie():
+    # Both routes reach B for 100, but only the earlier arrival (via C)
+    # makes the B->D connection.
+    flights = [
+        f("S", "B", "F1", "08:00", "12:00", 100, 200, 300),
+        f("S", "C", "F2", "08:00", "08:30", 50, 100, 150),
+        f("C", "B", "F3", "09:30", "10:00", 50, 100, 150),
+        f("B", "D", "F4", "12:30", "13:00", 10, 20, 30),
+    ]
+    graph = build_graph(flights)
+    itin = find_cheapest_itinerary(
+        graph, "S", "D", parse_time("07:00"), cabin="economy"
+    )
+    assert isinstance(itin, Itinerary)
+    assert [fl.flight_number for fl in itin.flights] == ["F2", "F3", "F4"]
+    assert itin.total_price("economy") == 110
+    assert_valid_itinerary_times(itin)
+
+
+@pytest.mark.parametrize("cheap_depart", ["01:00", "00:20"])
+def test_cheapest_itinerary_ignores_superseded_labels(cheap_depart: str):
+    # Fcheap replaces Fexp as the best label at B, but only Fexp arrives in
+    # time for Fbc. The superseded Fexp entry must not be expanded, whatever
+    # the departure order of the two A->B flights.
+    flights = [
+        f("A", "B", "Fexp", "00:30", "02:30", 200, 400, 800),
+        f("A", "B", "Fcheap", cheap_depart, "06:30", 100, 200, 400),
+        f("B", "C", "Fbc", "05:30", "06:00", 200, 400, 800),
+    ]
+    graph = build_graph(flights)
+    itin = find_cheapest_itinerary(
+        graph, "A", "C", parse_time("00:00"), cabin="economy"
+    )
+    assert itin is None
+
+
+def test_cheapest_multicabin_returns_per_cabin_itineraries():
+    # Economy and first favour the two-leg path; business favours the direct.
+    flights = [
+        f("A", "B", "Fdirect", "08:00", "10:00", 400, 500, 1700),
+        f("A", "X", "Fax", "08:00", "09:00", 150, 400, 800),
+        f("X", "B", "Fxb", "10:30", "11:30", 150, 400, 800),
+    ]
+    graph = build_graph(flights)
+
+    results = find_cheapest_multicabin(graph, "A", "B", parse_time("07:00"))
+
+    assert set(results) == {"economy", "business", "first"}
+    numbers = {
+        cabin: [fl.flight_number for fl in itin.flights]
+        for cabin, itin in results.items()
+    }
+    assert numbers == {
+        "economy": ["Fax", "Fxb"],
+        "business": ["Fdirect"],
+        "first": ["Fax", "Fxb"],
+    }
+
+    only_business = find_cheapest_multicabin(
+        graph, "A", "B", parse_time("07:00"), cabins=("business",)
+    )
+    assert list(only_business) == ["business"]
+
+
+def test_cheapest_multicabin_unknown_cabin_raises():
+    graph = build_graph([f("A", "B", "F1", "08:00", "09:00", 100, 200, 300)])
+    with pytest.raises(ValueError):
+        find_cheapest_multicabin(
+            graph, "A", "B", parse_time("07:00"), cabins=("economy", "premium")
+        )
+
+
 def test_cheapest_itinerary_no_route_returns_none():
     flights = [
         f("A", "C", "F1", "08:00", "09:00", 100, 200, 300),
@@ -67,6 +67,17 @@ def test_itinerary_properties_and_price_and_stops():
     assert first_total == 1500 + 2000
 
 
+def test_flight_prices_tuple_matches_cabin_fields():
+    fl = make_demo_itinerary().flights[0]
+    assert fl.prices == (300, 800, 1500)
+    assert fl.price_for("business") == 800
+
+    with pytest.raises(ValueError):
+        fl.price_for("premium")
+    with pytest.raises(ValueError):
+        fl.price_for("origin")  # a field, but not a cabin
+
+
 def test_format_comparison_table_basic():
     itin = make_demo_itinerary()
     rows = [
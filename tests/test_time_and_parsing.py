@@ -43,6 +43,20 @@ def test_parse_time_invalid_raises(bad: str):
         parse_time(bad)
 
 
+@pytest.mark.parametrize(
+    "text, minutes",
+    [
+        ("08:05", 8 * 60 + 5),
+        ("8:05", 8 * 60 + 5),      # single-digit hour
+        (" 08:05 ", 8 * 60 + 5),   # surrounding whitespace
+        ("00:00", 0),
+        ("23:59", 23 * 60 + 59),
+    ],
+)
+def test_parse_time_accepts_loose_formats(text: str, minutes: int):
+    assert parse_time(text) == minutes
+
+
 def test_parse_flight_line_txt_blank_and_comment():
     assert parse_flight_line_txt("   \n") is None
     assert parse_flight_line_txt("# comment line\n") is None
@@ -89,6 +103,22 @@ def test_load_flights_txt_basic(tmp_path: Path):
     assert ("NRT", "ICN") in codes
 
 
+def test_load_flights_txt_reports_bad_line_number(tmp_path: Path):
+    content = textwrap.dedent(
+        """
+        # Sample schedule
+        ICN NRT FW101 08:00 10:00 300 800 1500
+        NRT ICN FW102 11:00 13:00 320 820
+        """
+    ).strip()
+
+    path = tmp_path / "flights.txt"
+    path.write_text(content + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r":3:"):
+        load_flights_txt(str(path))
+
+
 def test_load_flights_csv_basic(tmp_path: Path):
     content = textwrap.dedent(
         """
@@ -107,6 +137,72 @@ def test_load_flights_csv_basic(tmp_path: Path):
     assert flights[1].dest == "ICN"
 
 
+def test_load_flights_csv_column_order_and_missing_columns(tmp_path: Path):
+    reordered = tmp_path / "reordered.csv"
+    reordered.write_text(
+        "flight_number,origin,dest,first,business,economy,depart,arrive\n"
+        "FW101,ICN,NRT,1500,800,300,08:00,10:00\n",
+        encoding="utf-8",
+    )
+    flights = load_flights_csv(str(reordered))
+    assert flights[0].flight_number == "FW101"
+    assert flights[0].origin == "ICN"
+    assert flights[0].economy == 300
+    assert flights[0].first == 1500
+
+    missing = tmp_path / "missing.csv"
+    missing.write_text(
+        "origin,dest,flight_number,depart,arrive,economy,business\n"
+        "ICN,NRT,FW101,08:00,10:00,300,800\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        load_flights_csv(str(missing))
+
+
+def test_load_flights_csv_skips_blank_lines(tmp_path: Path):
+    header = "origin,dest,flight_number,depart,arrive,economy,business,first\n"
+
+    middle = tmp_path / "middle.csv"
+    middle.write_text(
+        header
+        + "ICN,NRT,FW101,08:00,10:00,300,800,1500\n"
+        + "\n"
+        + "NRT,ICN,FW102,11:00,13:00,320,820,1520\n",
+        encoding="utf-8",
+    )
+    assert [fl.flight_number for fl in load_flights_csv(str(middle))] == ["FW101", "FW102"]
+
+    trailing = tmp_path / "trailing.csv"
+    trailing.write_text(header + "ICN,NRT,FW101,08:00,10:00,300,800,1500\n\n", encoding="utf-8")
+    assert len(load_flights_csv(str(trailing))) == 1
+
+
+def test_load_flights_csv_rejects_bad_rows(tmp_path: Path):
+    header = "origin,dest,flight_number,depart,arrive,economy,business,first\n"
+
+    backwards = tmp_path / "backwards.csv"
+    backwards.write_text(
+        header
+        + "ICN,NRT,FW101,08:00,10:00,300,800,1500\n"
+        + "NRT,ICN,FW102,13:00,11:00,320,820,1520\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="Arrival must be after departure"):
+        load_flights_csv(str(backwards))
+
+    short = tmp_path / "short.csv"
+    short.write_text(
+        header
+        + "ICN,NRT,FW101,08:00,10:00,300,800,1500\n"
+        + "\n"
+        + "ICN,NRT,FW102,08:00\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match=r"short\.csv:4: Expected at least 8 fields"):
+        load_flights_csv(str(short))
+
+
 def test_load_flights_dispatch_uses_extension(tmp_path: Path):
     # TXT file
     txt = tmp_path / "flights.txt"